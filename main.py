@@ -1,11 +1,15 @@
 #!/usr/bin/env python3
 import argparse
 import asyncio
+import re
+import struct
 from dataclasses import dataclass, field
-from typing import Dict, Optional, Tuple
+from time import monotonic
+from typing import Dict, List, NamedTuple, Optional, Tuple, Union
 
 import pygame
 from bleak import BleakClient
+from bleak.backends.characteristic import BleakGATTCharacteristic
 import sys
 import tkinter as tk
 from tkinter import messagebox
@@ -38,6 +42,9 @@ ALLOWED_NAME_FILTERS = [
     "ShellCar", "(string vazia)", "SL-Shell Car"
 ]
 
+# All filters combined into one case-insensitive pattern, compiled once at import
+_FILTER_RE = re.compile("|".join(re.escape(f) for f in ALLOWED_NAME_FILTERS), re.IGNORECASE)
+
 SELECTED_DEVICE_NAME = ""
 SELECTED_CONTROLLER_ID = 0
 
@@ -53,37 +60,45 @@ def center_window(win: tk.Tk, width: int, height: int) -> None:
     win.geometry(f"{width}x{height}+{x}+{y}")
 
 
+# Persistent event loop for Bleak scans, run on a daemon thread and created on first use
+_scan_loop: Optional[asyncio.AbstractEventLoop] = None
+_scan_thread: Optional[threading.Thread] = None
+
+
+def _get_scan_loop() -> asyncio.AbstractEventLoop:
+    global _scan_loop, _scan_thread
+    if _scan_loop is None:
+        _scan_loop = asyncio.new_event_loop()
+        _scan_thread = threading.Thread(target=_scan_loop.run_forever, daemon=True)
+        _scan_thread.start()
+    return _scan_loop
+
+
+def stop_scan_loop() -> None:
+    global _scan_loop, _scan_thread
+    if _scan_loop is None:
+        return
+    _scan_loop.call_soon_threadsafe(_scan_loop.stop)
+    _scan_thread.join(timeout=1.0)
+    if not _scan_loop.is_running():
+        _scan_loop.close()
+    _scan_loop = None
+    _scan_thread = None
+
+
 def pick_bluetooth_device() -> str:
     """
-    Runs BleakScanner.discover() in a background thread and keeps a Tk "please wait"
-    window responsive in the main thread. Polls for completion via after().
+    Runs BleakScanner.discover() on the persistent scan loop and keeps a Tk "please wait"
+    window responsive in the main thread. Polls the scan future for completion via after().
     """
     global SELECTED_DEVICE_NAME
 
-    devices_result = []
-    scan_exception = {"exc": None}
-    scan_thread = None
-    scan_done = {"done": False}
-
-    def scan_devices():
-        # run Bleak discovery in a fresh event loop inside this thread
-        try:
-            loop = asyncio.new_event_loop()
-            asyncio.set_event_loop(loop)
-            devices = loop.run_until_complete(BleakScanner.discover(timeout=3))
-            devices_result.extend(devices)
-        except Exception as e:
-            scan_exception["exc"] = e
-        finally:
-            try:
-                loop.stop()
-            except Exception:
-                pass
-            try:
-                loop.close()
-            except Exception:
-                pass
-            scan_done["done"] = True
+    # Submit the scan first so it overlaps Tk window setup; the scan loop never touches Tk.
+    # The OS BLE stack drops anything that doesn't advertise the control service.
+    scan_future = asyncio.run_coroutine_threadsafe(
+        BleakScanner.discover(timeout=2, service_uuids=[CONTROL_SERVICE_UUID]),
+        _get_scan_loop(),
+    )
 
     # Create "Please wait" popup on main thread
     wait_root = tk.Tk()
@@ -93,18 +108,14 @@ def pick_bluetooth_device() -> str:
     label.pack(expand=True, padx=12, pady=10)
     wait_root.update()
 
-    # Start scanner thread
-    scan_thread = threading.Thread(target=scan_devices, daemon=True)
-    scan_thread.start()
-
-    # Poll for completion safely using after()
+    # Poll for completion safely using after(); Tk calls stay on the main thread
     def poll():
-        if scan_done["done"]:
+        if scan_future.done():
             wait_root.quit()
             return
-        wait_root.after(100, poll)
+        wait_root.after(10, poll)
 
-    wait_root.after(100, poll)
+    wait_root.after(10, poll)
     wait_root.mainloop()
     try:
         wait_root.destroy()
@@ -112,14 +123,14 @@ def pick_bluetooth_device() -> str:
         pass
 
     # If scanning raised an exception, show it
-    if scan_exception["exc"] is not None:
-        messagebox.showerror("Scan Error", f"Bluetooth scan failed: {scan_exception['exc']}")
+    try:
+        devices = scan_future.result()
+    except Exception as e:
+        messagebox.showerror("Scan Error", f"Bluetooth scan failed: {e}")
         sys.exit(1)
 
-    devices = devices_result
-
-    # Filter matching devices
-    filtered = [d for d in devices if any(f.lower() in (d.name or "").lower() for f in ALLOWED_NAME_FILTERS)]
+    # Filter matching devices (secondary name check on top of the service UUID filter)
+    filtered = [d for d in devices if d.name and _FILTER_RE.search(d.name)]
 
     if not filtered:
         messagebox.showerror("No Matching Devices", "No Compatible Cars found")
@@ -173,6 +184,23 @@ BATTERY_CHARACTERISTIC_UUID = "00002a19-0000-1000-8000-00805f9b34fb"
 QueueItem = Tuple[str, Optional[object]]
 
 
+class StatusPayload(NamedTuple):
+    """Decoded 8-byte status notification; same lane layout as the control payload."""
+    length: int
+    mode: int
+    forward: int
+    reverse: int
+    left: int
+    right: int
+    lights: int
+    turbo: int
+    donut: int
+
+
+# UI items where only the newest value matters; at most one of each is queued at a time
+COALESCED_UI_KINDS = frozenset({"status", "payload", "battery"})
+
+
 @dataclass
 class ControlState:
     mode: int = 1
@@ -183,42 +211,51 @@ class ControlState:
     donut: bool = False
     battery_pct: Optional[int] = None
     last_payload: bytes = b""
-    last_status: Dict[str, int] = field(default_factory=dict)
+    last_status: Union[StatusPayload, Dict[str, int]] = field(default_factory=dict)
     last_status_hex: str = ""
     message: str = ""
 
 
+_CONTROL_STRUCT = struct.Struct("<8B")
+
+
 def build_control_payload(state: ControlState) -> bytes:
-    return bytes(
-        [
-            state.mode & 0xFF,
-            1 if state.throttle > 0 else 0,
-            1 if state.throttle < 0 else 0,
-            1 if state.steering < 0 else 0,
-            1 if state.steering > 0 else 0,
-            int(state.lights),
-            int(state.turbo),
-            int(state.donut),
-        ]
+    throttle = state.throttle
+    steering = state.steering
+    return _CONTROL_STRUCT.pack(
+        state.mode & 0xFF,
+        throttle > 0,
+        throttle < 0,
+        steering < 0,
+        steering > 0,
+        state.lights,
+        state.turbo,
+        state.donut,
     )
 
 
-def decode_status_payload(data: bytes) -> Dict[str, int]:
+def build_control_fingerprint(state: ControlState) -> int:
+    """Pack everything build_control_payload depends on into one int, for cheap change checks."""
+    throttle = state.throttle
+    steering = state.steering
+    return (
+        (state.mode & 0xFF)
+        | (throttle > 0) << 8
+        | (throttle < 0) << 9
+        | (steering < 0) << 10
+        | (steering > 0) << 11
+        | bool(state.lights) << 12
+        | bool(state.turbo) << 13
+        | bool(state.donut) << 14
+    )
+
+
+def decode_status_payload(data: Union[bytes, bytearray]) -> Union[StatusPayload, Dict[str, int]]:
     length = len(data)
+    if length == 8:
+        return StatusPayload(length, *_CONTROL_STRUCT.unpack(data))
     if length == 1:
         return {"length": length, "battery_pct": data[0]}
-    if length == 8:
-        return {
-            "length": length,
-            "mode": data[0],
-            "forward": data[1],
-            "reverse": data[2],
-            "left": data[3],
-            "right": data[4],
-            "lights": data[5],
-            "turbo": data[6],
-            "donut": data[7],
-        }
     return {"length": length, "raw": data.hex()}
 
 
@@ -245,8 +282,7 @@ class ControlRateLimiter:
         self.min_interval = min_interval
 
     def should_send(self, payload: bytes) -> bool:
-        import time
-        now = time.monotonic()
+        now = monotonic()
         if payload != self._last_payload or (now - self._last_time) >= self.min_interval:
             self._last_payload = payload
             self._last_time = now
@@ -270,7 +306,15 @@ class BleController:
         self._battery_notify = False
         self._stop_event = asyncio.Event()
         self._write_lock = asyncio.Lock()
-        self._pending_payload: Optional[bytes] = None
+        # latest-wins transmit register drained by a single writer task
+        self._tx_slot: Optional[bytes] = None
+        self._tx_event = asyncio.Event()
+        self._writer_task: Optional["asyncio.Task[None]"] = None
+        # newest data for each coalesced UI kind with a queued, not yet consumed item
+        self._latest_ui: Dict[str, Optional[object]] = {}
+        # resolved after connecting so writes skip Bleak's UUID lookup
+        self._control_char: Union[BleakGATTCharacteristic, str] = CONTROL_CHARACTERISTIC_UUID
+        self._battery_char: Union[BleakGATTCharacteristic, str] = BATTERY_CHARACTERISTIC_UUID
         self._last_sent_payload: Optional[bytes] = None
         self._stopped = False
 
@@ -286,10 +330,14 @@ class BleController:
             async with BleakClient(self.address, timeout=45.0) as client:
                 self._client = client
                 self._queue_ui(("connected", None))
+                self._resolve_characteristics(client)
                 await self._enable_notifications(client)
-                await self._send_pending()
-                await self._read_battery(client)
-                await self._stop_event.wait()
+                self._writer_task = asyncio.create_task(self._writer())
+                try:
+                    await self._read_battery(client)
+                    await self._stop_event.wait()
+                finally:
+                    await self._cancel_writer()
         except asyncio.CancelledError:
             raise
         except Exception as exc:  # pragma: no cover - best effort logging
@@ -300,8 +348,28 @@ class BleController:
             except Exception:
                 pass
             self._client = None
+            self._control_char = CONTROL_CHARACTERISTIC_UUID
+            self._battery_char = BATTERY_CHARACTERISTIC_UUID
             self._queue_ui(("disconnected", None))
 
+    def _resolve_characteristics(self, client: BleakClient) -> None:
+        """Cache characteristic objects, falling back to the UUID if one can't be found."""
+        try:
+            control_service = client.services.get_service(CONTROL_SERVICE_UUID)
+            if control_service:
+                self._control_char = (
+                    control_service.get_characteristic(CONTROL_CHARACTERISTIC_UUID) or CONTROL_CHARACTERISTIC_UUID
+                )
+            battery_service = client.services.get_service(BATTERY_SERVICE_UUID)
+            if battery_service:
+                self._battery_char = (
+                    battery_service.get_characteristic(BATTERY_CHARACTERISTIC_UUID) or BATTERY_CHARACTERISTIC_UUID
+                )
+        except Exception:
+            # services not discovered yet or ambiguous UUIDs: keep writing by UUID
+            self._control_char = CONTROL_CHARACTERISTIC_UUID
+            self._battery_char = BATTERY_CHARACTERISTIC_UUID
+
     async def _enable_notifications(self, client: BleakClient) -> None:
         try:
             await client.start_notify(STATUS_CHARACTERISTIC_UUID, self._status_handler)
@@ -309,7 +377,7 @@ class BleController:
         except Exception as exc:
             self._queue_ui(("warn", f"Status notify failed: {exc}"))
         try:
-            await client.start_notify(BATTERY_CHARACTERISTIC_UUID, self._battery_handler)
+            await client.start_notify(self._battery_char, self._battery_handler)
             self._battery_notify = True
         except Exception as exc:
             self._queue_ui(("warn", f"Battery notify failed: {exc}"))
@@ -327,29 +395,27 @@ class BleController:
                 self._status_notify = False
         if self._battery_notify:
             try:
-                await client.stop_notify(BATTERY_CHARACTERISTIC_UUID)
+                await client.stop_notify(self._battery_char)
             except Exception:
                 pass
             finally:
                 self._battery_notify = False
 
     def _status_handler(self, _: int, data: bytearray) -> None:
-        payload = bytes(data)
-        hex_data = payload.hex()
+        hex_data = data.hex()
         if hex_data == self._last_status_hex:
             return
         self._last_status_hex = hex_data
-        decoded = decode_status_payload(payload)
+        decoded = decode_status_payload(data)
         self.state.last_status = decoded
         self.state.last_status_hex = hex_data
         self._queue_ui(("status", None))
 
 
     def _battery_handler(self, _: int, data: bytearray) -> None:
-        payload = bytes(data)
-        if not payload:
+        if not data:
             return
-        val = int(payload[0])
+        val = data[0]
         if val == self._last_battery:
             return
         self._last_battery = val
@@ -359,7 +425,7 @@ class BleController:
 
     async def _read_battery(self, client: BleakClient) -> None:
         try:
-            data = await client.read_gatt_char(BATTERY_CHARACTERISTIC_UUID)
+            data = await client.read_gatt_char(self._battery_char)
         except Exception as exc:
             self._queue_ui(("warn", f"Initial battery read failed: {exc}"))
             return
@@ -367,44 +433,80 @@ class BleController:
             self.state.battery_pct = int(data[0])
             self._queue_ui(("battery", int(data[0])))
 
+    def submit(self, payload: bytes) -> None:
+        """Queue a control payload for the writer task, replacing any not yet sent."""
+        self._tx_slot = payload
+        self._tx_event.set()
+
+    def _requeue(self, payload: bytes) -> None:
+        # retried on the writer's next min_interval tick, unless something newer was submitted
+        if self._tx_slot is None:
+            self._tx_slot = payload
+
+    async def _writer(self) -> None:
+        interval = self._rate_limiter.min_interval
+        while not self._stopped and self._client:
+            try:
+                await asyncio.wait_for(self._tx_event.wait(), interval)
+            except asyncio.TimeoutError:
+                pass
+            self._tx_event.clear()
+            payload = self._tx_slot
+            self._tx_slot = None
+            if payload is None:
+                # nothing new for min_interval: repeat the current state, since
+                # response=False writes give no feedback if the car missed one
+                payload = self._last_sent_payload
+            if payload is not None:
+                await self.send_control(payload)
+
+    async def _cancel_writer(self) -> None:
+        writer_task = self._writer_task
+        self._writer_task = None
+        if writer_task is not None:
+            writer_task.cancel()
+            await asyncio.gather(writer_task, return_exceptions=True)
+
     async def send_control(self, payload: bytes) -> None:
         if self._stopped or not self._client:
             return
         if not self._rate_limiter.should_send(payload):
+            self._requeue(payload)
             return
         async with self._write_lock:
-            try:
-                await self._client.write_gatt_char(
-                    CONTROL_CHARACTERISTIC_UUID,
-                    payload,
-                    response=False,
-                )
-                self._last_sent_payload = payload
-                self.state.last_payload = payload
-                self._queue_ui(("payload", payload))
-            except Exception as exc:
-                self._queue_ui(("error", f"ERROR sending command: {exc}"))
+            # stop may have written the final packet while we waited for the lock
+            if self._stopped:
+                return
+            await self._write_control(payload)
 
+    async def send_stop(self, payload: bytes) -> None:
+        """Write the final stop packet; nothing submitted earlier may be written after it."""
+        if self._stopped:
+            return
+        self._stopped = True
+        self._tx_slot = None
+        await self._cancel_writer()
+        async with self._write_lock:
+            await self._write_control(payload)
 
-    async def _write_pending(self) -> None:
+    async def _write_control(self, payload: bytes) -> None:
+        # caller holds _write_lock
         if not self._client:
             return
-        async with self._write_lock:
-            while self._pending_payload is not None and self._client:
-                payload = self._pending_payload
-                self._pending_payload = None
-                try:
-                    await self._client.write_gatt_char(
-                        CONTROL_CHARACTERISTIC_UUID,
-                        payload,
-                        response=False,
-                    )
-                except Exception as exc:
-                    self._queue_ui(("error", f"ERROR sending command: {exc}"))
-                    break
-                self._last_sent_payload = payload
-                self.state.last_payload = payload
+        try:
+            await self._client.write_gatt_char(
+                self._control_char,
+                payload,
+                response=False,
+            )
+            if payload != self._last_sent_payload:
                 self._queue_ui(("payload", payload))
+            self._last_sent_payload = payload
+            self.state.last_payload = payload
+        except Exception as exc:
+            self._queue_ui(("error", f"ERROR sending command: {exc}"))
+            if not self._stopped:
+                self._requeue(payload)
 
     async def request_battery(self) -> None:
         if self._stopped:
@@ -414,52 +516,99 @@ class BleController:
             return
         await self._read_battery(self._client)
 
-    async def _send_pending(self) -> None:
-        if self._pending_payload is not None and self._client:
-            await self._write_pending()
-
     async def stop(self) -> None:
-        if self._stopped:
-            return
         self._stopped = True
+        if self._stop_event.is_set():
+            return
         self._stop_event.set()
         await self._disable_notifications()
 
     def _queue_ui(self, item: QueueItem) -> None:
-        try:
-            self.ui_queue.put_nowait(item)
-        except asyncio.QueueFull:
-            pass
+        kind, data = item
+        if kind in COALESCED_UI_KINDS:
+            already_queued = kind in self._latest_ui
+            self._latest_ui[kind] = data
+            if already_queued:
+                return
+        self.ui_queue.put_nowait(item)
+
+    def take_latest_ui(self, kind: str) -> Optional[object]:
+        """Return the newest value for a coalesced UI item and mark it as consumed."""
+        return self._latest_ui.pop(kind, None)
+
+
+# Rest values for gamepad axes 0-5 (axes 4/5 are triggers, which rest at -1.0),
+# so a pad without triggers reads as turbo off
+GAMEPAD_AXIS_DEFAULTS: Tuple[float, ...] = (0.0, 0.0, 0.0, 0.0, -1.0, -1.0)
+
+# Keyboard dispatch: pygame key constant -> (action, argument)
+KEY_ACTIONS: Dict[int, Tuple[str, object]] = {
+    pygame.K_w: ("throttle", pygame.K_w),
+    pygame.K_s: ("throttle", pygame.K_s),
+    pygame.K_a: ("steer", pygame.K_a),
+    pygame.K_d: ("steer", pygame.K_d),
+    pygame.K_l: ("toggle", pygame.K_l),
+    pygame.K_t: ("toggle", pygame.K_t),
+    pygame.K_o: ("toggle", pygame.K_o),
+    pygame.K_m: ("toggle", pygame.K_m),
+    pygame.K_b: ("toggle", pygame.K_b),
+    pygame.K_q: ("toggle", pygame.K_q),
+    pygame.K_PLUS: ("controller", 1),
+    pygame.K_EQUALS: ("controller", 1),
+    pygame.K_KP_PLUS: ("controller", 1),
+    pygame.K_MINUS: ("controller", -1),
+    pygame.K_UNDERSCORE: ("controller", -1),
+    pygame.K_KP_MINUS: ("controller", -1),
+}
 
 
 class PygameApp:
     BG_COLOR = (36, 0, 0)
     TEXT_COLOR = (224, 224, 224)
     ACCENT_COLOR = (251, 206, 7)
+    FRAME_INTERVAL = 1 / 60
+    DRAW_INTERVAL = 1 / 30  # status readout doesn't need more than 30 redraws per second
+    INSTRUCTIONS_COLOR = (180, 180, 180)
+    INSTRUCTIONS = (
+        "Left Analog: steering, Right Analog/A & B: throttle, BACK: lights, RT/LT: turbo\n"
+        "      [O]: donut, [M]: mode, [B]: battery, [Q]: quit, [+]/[-]: switch controller"
+    )
 
     def __init__(self, loop: asyncio.AbstractEventLoop, address: str) -> None:
         self.loop = loop
         self.address = address
         self.state = ControlState()
+        # unbounded, but high-rate kinds are coalesced so it can't grow under a notification flood
         self.ui_queue: asyncio.Queue[QueueItem] = asyncio.Queue()
         self.ble = BleController(loop, address, self.state, self.ui_queue)
 
         self.running = False
         self.message = ""
-
-        self.throttle_keys_down: set[str] = set()
-        self.steering_keys_down: set[str] = set()
-        self.toggle_keys_down: set[str] = set()
-        self.last_throttle_key: Optional[str] = None
-        self.last_steering_key: Optional[str] = None
+        self._last_fingerprint: Optional[int] = None
+        self._state_dirty = False
+        self._ui_dirty = True
+        self._next_draw = 0.0
+
+        # pygame key constants, not key names
+        self.throttle_keys_down: set[int] = set()
+        self.steering_keys_down: set[int] = set()
+        self.toggle_keys_down: set[int] = set()
+        self.last_throttle_key: Optional[int] = None
+        self.last_steering_key: Optional[int] = None
 
         self.screen: Optional[pygame.Surface] = None
         self.font: Optional[pygame.font.Font] = None
         self.small_font: Optional[pygame.font.Font] = None
+        self._text_cache: Dict[Tuple[int, str, Tuple[int, int, int]], pygame.Surface] = {}
+        self._target_surf: Optional[pygame.Surface] = None
+        self._instructions_surfs: List[pygame.Surface] = []
 
         # Initialize gamepad (joystick) support
         pygame.joystick.init()
         self.gamepad = None
+        self._gamepad_axis_count = 0
+        self._gamepad_button_count = 0
+        self._last_gamepad_sample: Optional[Tuple[Tuple[float, ...], Tuple[int, int]]] = None
         self._init_gamepad(SELECTED_CONTROLLER_ID)
 
     def _init_gamepad(self, index: int) -> None:
@@ -467,6 +616,7 @@ class PygameApp:
         Initialize or re-initialize the active gamepad safely.
         """
         global SELECTED_CONTROLLER_ID
+        self._last_gamepad_sample = None
         try:
             count = pygame.joystick.get_count()
         except Exception:
@@ -480,6 +630,7 @@ class PygameApp:
                 pass
             self.gamepad = None
             self.state.message = "No controllers detected"
+            self._ui_dirty = True
             return
         # wrap index
         idx = int(index) % count
@@ -493,6 +644,8 @@ class PygameApp:
                     pass
             self.gamepad = pygame.joystick.Joystick(idx)
             self.gamepad.init()
+            self._gamepad_axis_count = min(self.gamepad.get_numaxes(), len(GAMEPAD_AXIS_DEFAULTS))
+            self._gamepad_button_count = self.gamepad.get_numbuttons()
             name = None
             try:
                 name = self.gamepad.get_name()
@@ -502,15 +655,35 @@ class PygameApp:
         except Exception as e:
             self.gamepad = None
             self.state.message = f"Gamepad init failed: {e}"
+        finally:
+            self._ui_dirty = True
 
     async def run(self) -> None:
-        pygame.init()
+        # only the subsystems we use; audio etc. stay uninitialized
+        pygame.display.init()
         pygame.font.init()
+        pygame.joystick.init()
         pygame.display.set_caption("Shell Racing Legends Controller (pygame)")
         self.screen = pygame.display.set_mode((720, 420))
-        self.font = pygame.font.SysFont("Segoe UI", 22, bold=True)
-        self.small_font = pygame.font.SysFont("Segoe UI", 16, bold=True)
+        # resolve the bold face once; None (not installed) loads pygame's default font
+        # with the same size scaling SysFont applied
+        font_path = pygame.font.match_font("segoeui", bold=True)
+        self.font = pygame.font.Font(font_path, 22)
+        self.small_font = pygame.font.Font(font_path, 16)
+        self._prerender_static()
         pygame.key.set_repeat(0)
+        # drop mouse/axis/window floods in SDL before they reach Python
+        pygame.event.set_blocked(None)
+        pygame.event.set_allowed(
+            [
+                pygame.QUIT,
+                pygame.KEYDOWN,
+                pygame.KEYUP,
+                pygame.JOYBUTTONDOWN,
+                pygame.JOYBUTTONUP,
+                pygame.VIDEOEXPOSE,
+            ]
+        )
 
         ble_task = asyncio.create_task(self.ble.run())
         ui_task = asyncio.create_task(self.ui_consumer())
@@ -521,16 +694,13 @@ class PygameApp:
             await self.shutdown()
             await asyncio.gather(ble_task, return_exceptions=True)
             # notify ui consumer to exit
-            try:
-                self.ui_queue.put_nowait(("shutdown", None))
-            except Exception:
-                pass
+            self.ui_queue.put_nowait(("shutdown", None))
             await asyncio.gather(ui_task, return_exceptions=True)
             pygame.quit()
 
     async def mainloop(self) -> None:
         self.running = True
-        clock = pygame.time.Clock()
+        next_frame = self.loop.time()
 
         # reset the steering state
         self.state.steering = 0
@@ -545,6 +715,8 @@ class PygameApp:
                     self.handle_keydown(event)
                 elif event.type == pygame.KEYUP:
                     self.handle_keyup(event)
+                elif event.type == pygame.VIDEOEXPOSE:
+                    self._ui_dirty = True
                 # Check gamepad events (button presses)
                 if event.type == pygame.JOYBUTTONDOWN:
                     self.handle_gamepad_buttondown(event)
@@ -559,30 +731,56 @@ class PygameApp:
                 # defensive: if gamepad throws, re-init safely
                 self._init_gamepad(SELECTED_CONTROLLER_ID)
 
-            self.draw()
-            await asyncio.sleep(0)
-            clock.tick(60)
+            # Send at most one control packet per frame, after all inputs are applied
+            if self._state_dirty:
+                try:
+                    self._flush_state()
+                except Exception:
+                    pass
+
+            # Redraw only when something visible changed, capped at DRAW_INTERVAL
+            now = self.loop.time()
+            if self._ui_dirty and now >= self._next_draw:
+                self._ui_dirty = False
+                self._next_draw = now + self.DRAW_INTERVAL
+                self.draw()
+
+            # Pace frames with the event loop rather than Clock.tick(), which would
+            # block BLE writes and notifications while it sleeps
+            next_frame += self.FRAME_INTERVAL
+            delay = next_frame - self.loop.time()
+            if delay < 0:
+                # fell behind; resync instead of running a burst of catch-up frames
+                next_frame = self.loop.time()
+            await asyncio.sleep(max(0.0, delay))
 
     def update_gamepad_controls(self) -> None:
         if not self.gamepad:
             return
+        pad = self.gamepad
         try:
-            throttle = self.gamepad.get_axis(3)  # -1 for reverse, 1 for forward
-        except Exception:
-            throttle = 0
-        try:
-            steering = self.gamepad.get_axis(0)
-        except Exception:
-            steering = 0
-        try:
-            turboAxis0 = self.gamepad.get_axis(5)
-        except Exception:
-            turboAxis0 = 1.0
-        try:
-            turboAxis1 = self.gamepad.get_axis(4)
-        except Exception:
-            turboAxis1 = 1.0
+            # one pass over the axes; missing axes on smaller pads keep their rest value
+            axes = tuple(pad.get_axis(i) for i in range(self._gamepad_axis_count))
+            axes += GAMEPAD_AXIS_DEFAULTS[len(axes):]
+            # (A, B) buttons
+            buttons = (pad.get_button(0), pad.get_button(1)) if self._gamepad_button_count > 1 else (0, 0)
+        except pygame.error:
+            self._init_gamepad(SELECTED_CONTROLLER_ID)
+            return
 
+        # nothing moved since last frame: leave the state (and any keyboard input) alone
+        sample = (axes, buttons)
+        if sample == self._last_gamepad_sample:
+            return
+        self._last_gamepad_sample = sample
+
+        steering = axes[0]
+        throttle = axes[3]  # -1 for reverse, 1 for forward
+        turboAxis1 = axes[4]
+        turboAxis0 = axes[5]
+        buttonA, buttonB = buttons
+
+        previous = (self.state.throttle, self.state.steering, self.state.turbo)
         self.state.throttle = 0
 
         if throttle < -0.5:
@@ -591,17 +789,14 @@ class PygameApp:
             self.state.throttle = -1  
 
         # Button-based throttle fallback
-        try:
-            buttonInput = 0
-            if self.gamepad.get_button(1):  # Button B
-                buttonInput -= 1
-            elif self.gamepad.get_button(0):  # Button A
-                buttonInput += 1
-
-            if buttonInput != 0:
-                self.state.throttle = buttonInput
-        except Exception:
-            pass
+        buttonInput = 0
+        if buttonB:
+            buttonInput -= 1
+        elif buttonA:
+            buttonInput += 1
+
+        if buttonInput != 0:
+            self.state.throttle = buttonInput
 
         self.state.steering = 0
         if steering < -0.5:
@@ -613,13 +808,18 @@ class PygameApp:
         if turboAxis0 > -0.5 or turboAxis1 > -0.5:
             self.state.turbo = 1
 
-        # Update the control payload with the new state (fire-and-forget)
-        try:
-            payload = build_control_payload(self.state)
-            self.loop.create_task(self.ble.send_control(payload))
+        if (self.state.throttle, self.state.steering, self.state.turbo) != previous:
+            self._state_dirty = True
+            self._ui_dirty = True
 
-        except Exception:
-            pass
+    def _flush_state(self) -> None:
+        """Submit at most one control write per frame, skipping it if the payload hasn't changed."""
+        self._state_dirty = False
+        fingerprint = build_control_fingerprint(self.state)
+        if fingerprint == self._last_fingerprint:
+            return
+        self._last_fingerprint = fingerprint
+        self.ble.submit(build_control_payload(self.state))
 
     def handle_gamepad_buttondown(self, event: pygame.event.Event) -> None:
         # Example: button 0 is "A" on Xbox controllers, or "Cross" on PlayStation controllers
@@ -627,7 +827,8 @@ class PygameApp:
             if event.button == 6:  # BACK
                 self.state.lights = not self.state.lights
                 self.state.message = f"Lights {'ON' if self.state.lights else 'OFF'}"
-                self.loop.create_task(self.ble.send_control(build_control_payload(self.state)))
+                self._state_dirty = True
+                self._ui_dirty = True
         except Exception:
             pass
 
@@ -637,63 +838,67 @@ class PygameApp:
     def handle_keydown(self, event: pygame.event.Event) -> None:
         if not self.running:
             return
-        key_name = pygame.key.name(event.key).lower()
-        if key_name in {"w", "s"}:
-            self.throttle_keys_down.add(key_name)
-            self.last_throttle_key = key_name
+        action = KEY_ACTIONS.get(event.key)
+        if action is None:
+            return
+        self._ui_dirty = True
+        kind, arg = action
+        if kind == "throttle":
+            self.throttle_keys_down.add(arg)
+            self.last_throttle_key = arg
             if self._update_throttle_from_keys():
-                self.loop.create_task(self.ble.send_control(build_control_payload(self.state)))
-        elif key_name in {"a", "d"}:
-            self.steering_keys_down.add(key_name)
-            self.last_steering_key = key_name
+                self._state_dirty = True
+        elif kind == "steer":
+            self.steering_keys_down.add(arg)
+            self.last_steering_key = arg
             if self._update_steering_from_keys():
-                self.loop.create_task(self.ble.send_control(build_control_payload(self.state)))
-        elif key_name in {"l", "t", "o", "m", "b", "q"}:
-            if key_name not in self.toggle_keys_down:
-                self.toggle_keys_down.add(key_name)
-                self._handle_toggle_press(key_name)
-
+                self._state_dirty = True
+        elif kind == "toggle":
+            if arg not in self.toggle_keys_down:
+                self.toggle_keys_down.add(arg)
+                self._handle_toggle_press(arg)
+        elif kind == "controller":
+            self._switch_controller(arg)
+
+    def _switch_controller(self, step: int) -> None:
         # controller slot switching via + / -
         global SELECTED_CONTROLLER_ID
-        if key_name in {"+", "=", "kp_plus"}:
-            try:
-                count = pygame.joystick.get_count()
-            except Exception:
-                count = 0
-            if count > 0:
-                SELECTED_CONTROLLER_ID = (SELECTED_CONTROLLER_ID + 1) % count
-                self._init_gamepad(SELECTED_CONTROLLER_ID)
-        elif key_name in {"-", "_", "kp_minus"}:
-            try:
-                count = pygame.joystick.get_count()
-            except Exception:
-                count = 0
-            if count > 0:
-                SELECTED_CONTROLLER_ID = (SELECTED_CONTROLLER_ID - 1) % count
-                self._init_gamepad(SELECTED_CONTROLLER_ID)
+        try:
+            count = pygame.joystick.get_count()
+        except Exception:
+            count = 0
+        if count > 0:
+            SELECTED_CONTROLLER_ID = (SELECTED_CONTROLLER_ID + step) % count
+            self._init_gamepad(SELECTED_CONTROLLER_ID)
 
     def handle_keyup(self, event: pygame.event.Event) -> None:
-        key_name = pygame.key.name(event.key).lower()
-        if key_name in self.throttle_keys_down:
-            self.throttle_keys_down.discard(key_name)
-            if self._update_throttle_from_keys():
-                self.loop.create_task(self.ble.send_control(build_control_payload(self.state)))
-        elif key_name in self.steering_keys_down:
-            self.steering_keys_down.discard(key_name)
-            if self._update_steering_from_keys():
-                self.loop.create_task(self.ble.send_control(build_control_payload(self.state)))
-        if key_name in self.toggle_keys_down:
-            self.toggle_keys_down.discard(key_name)
+        action = KEY_ACTIONS.get(event.key)
+        if action is None:
+            return
+        self._ui_dirty = True
+        kind, arg = action
+        if kind == "throttle":
+            if arg in self.throttle_keys_down:
+                self.throttle_keys_down.discard(arg)
+                if self._update_throttle_from_keys():
+                    self._state_dirty = True
+        elif kind == "steer":
+            if arg in self.steering_keys_down:
+                self.steering_keys_down.discard(arg)
+                if self._update_steering_from_keys():
+                    self._state_dirty = True
+        elif kind == "toggle":
+            self.toggle_keys_down.discard(arg)
 
     def _update_throttle_from_keys(self) -> bool:
         old = self.state.throttle
         new_value = 0
 
-        if "w" in self.throttle_keys_down and "s" in self.throttle_keys_down:
-            new_value = 1 if self.last_throttle_key == "w" else -1
-        elif "w" in self.throttle_keys_down:
+        if pygame.K_w in self.throttle_keys_down and pygame.K_s in self.throttle_keys_down:
+            new_value = 1 if self.last_throttle_key == pygame.K_w else -1
+        elif pygame.K_w in self.throttle_keys_down:
             new_value = 1
-        elif "s" in self.throttle_keys_down:
+        elif pygame.K_s in self.throttle_keys_down:
             new_value = -1
         if new_value != old:
             self.state.throttle = new_value
@@ -705,11 +910,11 @@ class PygameApp:
         old = self.state.steering
         new_value = 0
 
-        if "a" in self.steering_keys_down and "d" in self.steering_keys_down:
-            new_value = -1 if self.last_steering_key == "a" else 1
-        elif "a" in self.steering_keys_down:
+        if pygame.K_a in self.steering_keys_down and pygame.K_d in self.steering_keys_down:
+            new_value = -1 if self.last_steering_key == pygame.K_a else 1
+        elif pygame.K_a in self.steering_keys_down:
             new_value = -1
-        elif "d" in self.steering_keys_down:
+        elif pygame.K_d in self.steering_keys_down:
             new_value = 1
         if new_value != old:
             self.state.steering = new_value
@@ -717,27 +922,28 @@ class PygameApp:
             return True
         return False
 
-    def _handle_toggle_press(self, key_name: str) -> None:
-        if key_name == "l":
+    def _handle_toggle_press(self, key: int) -> None:
+        self._ui_dirty = True
+        if key == pygame.K_l:
             self.state.lights = not self.state.lights
             self.state.message = f"Lights {'ON' if self.state.lights else 'OFF'}"
-            self.loop.create_task(self.ble.send_control(build_control_payload(self.state)))
-        elif key_name == "t":
+            self._state_dirty = True
+        elif key == pygame.K_t:
             self.state.turbo = not self.state.turbo
             self.state.message = f"Turbo {'ON' if self.state.turbo else 'OFF'}"
-            self.loop.create_task(self.ble.send_control(build_control_payload(self.state)))
-        elif key_name == "o":
+            self._state_dirty = True
+        elif key == pygame.K_o:
             self.state.donut = not self.state.donut
             self.state.message = f"Donut {'ON' if self.state.donut else 'OFF'}"
-            self.loop.create_task(self.ble.send_control(build_control_payload(self.state)))
-        elif key_name == "m":
+            self._state_dirty = True
+        elif key == pygame.K_m:
             self.state.mode = 2 if self.state.mode == 1 else 1
             self.state.message = f"Mode set to {self.state.mode}"
-            self.loop.create_task(self.ble.send_control(build_control_payload(self.state)))
-        elif key_name == "b":
+            self._state_dirty = True
+        elif key == pygame.K_b:
             self.state.message = "Battery refresh requested"
             self.loop.create_task(self.ble.request_battery())
-        elif key_name == "q":
+        elif key == pygame.K_q:
             self.loop.create_task(self.shutdown())
 
     async def ui_consumer(self) -> None:
@@ -745,9 +951,12 @@ class PygameApp:
             kind, data = await self.ui_queue.get()
             if kind == "shutdown":
                 break
+            if kind in COALESCED_UI_KINDS:
+                data = self.ble.take_latest_ui(kind)
             self._handle_ui_message(kind, data)
 
     def _handle_ui_message(self, kind: str, data: Optional[object]) -> None:
+        self._ui_dirty = True
         if kind == "message":
             self.message = str(data)
         elif kind == "warn":
@@ -779,7 +988,7 @@ class PygameApp:
         self.state.throttle = 0
         self.state.steering = 0
         try:
-            await self.ble.send_control(build_control_payload(self.state))
+            await self.ble.send_stop(build_control_payload(self.state))
         except Exception:
             pass
         try:
@@ -788,7 +997,7 @@ class PygameApp:
             pass
 
     def draw(self) -> None:
-        if not self.screen or not self.font or not self.small_font:
+        if not self.screen or not self.font or not self._target_surf:
             return
         self.screen.fill(self.BG_COLOR)
 
@@ -797,8 +1006,9 @@ class PygameApp:
         except Exception:
             gp_name = "Unknown"
 
+        # line 0 is the pre-rendered target header
+        self.screen.blit(self._target_surf, (24, 24))
         lines = [
-            f"Target: {SELECTED_DEVICE_NAME} ({self.address})",
             f"Battery: {'--' if self.state.battery_pct is None else str(self.state.battery_pct) + '%'}",
             f"Throttle: {throttle_label(self.state.throttle)}",
             f"Steering: {steering_label(self.state.steering)}",
@@ -810,31 +1020,49 @@ class PygameApp:
             f"Gamepad: {gp_name}",
         ]
 
-        for idx, text in enumerate(lines):
-            surface = self.font.render(text, True, self.TEXT_COLOR)
+        for idx, text in enumerate(lines, start=1):
+            surface = self._render(self.font, text, self.TEXT_COLOR)
             self.screen.blit(surface, (24, 24 + idx * 28))
 
         message = self.message or self.state.message or "--"
-        message_surface = self.font.render(f"Message: {message}", True, self.ACCENT_COLOR)
-        self.screen.blit(message_surface, (24, 24 + len(lines) * 28 + 12))
-
-        instructions = (
-            "Left Analog: steering, Right Analog/A & B: throttle, BACK: lights, RT/LT: turbo\n"
-            "      [O]: donut, [M]: mode, [B]: battery, [Q]: quit, [+]/[-]: switch controller"
-        )
+        message_surface = self._render(self.font, f"Message: {message}", self.ACCENT_COLOR)
+        self.screen.blit(message_surface, (24, 24 + (len(lines) + 1) * 28 + 12))
 
-        lines = instructions.split("\n")
         y = self.screen.get_height() - 60  # start a bit higher for two lines
-        for i, line in enumerate(lines):
-            surface = self.small_font.render(line, True, (180, 180, 180))
+        for i, surface in enumerate(self._instructions_surfs):
             self.screen.blit(surface, (24, y + i * 20))
 
         pygame.display.flip()
 
+    def _prerender_static(self) -> None:
+        """Render the text that never changes during a session once, at startup."""
+        self._target_surf = self.font.render(
+            f"Target: {SELECTED_DEVICE_NAME} ({self.address})", True, self.TEXT_COLOR
+        )
+        # kept as one transparent surface per line: the block sits close enough to the
+        # message line that an opaque backing would clip its descenders
+        self._instructions_surfs = [
+            self.small_font.render(line, True, self.INSTRUCTIONS_COLOR)
+            for line in self.INSTRUCTIONS.split("\n")
+        ]
+
+    def _render(self, font: pygame.font.Font, text: str, color: Tuple[int, int, int]) -> pygame.Surface:
+        """Render text through a small cache; most labels only take a handful of values."""
+        key = (id(font), text, color)
+        surface = self._text_cache.get(key)
+        if surface is None:
+            surface = font.render(text, True, color)
+            if len(self._text_cache) >= 128:
+                self._text_cache.clear()
+            self._text_cache[key] = surface
+        return surface
+
     def _format_last_status(self) -> str:
-        if self.state.last_status:
-            items = [f"{k}={v}" for k, v in self.state.last_status.items() if k != "length"]
-            return ", ".join(items) if items else str(self.state.last_status)
+        status = self.state.last_status
+        if status:
+            fields = status._asdict() if isinstance(status, StatusPayload) else status
+            items = [f"{k}={v}" for k, v in fields.items() if k != "length"]
+            return ", ".join(items) if items else str(status)
         if self.state.last_status_hex:
             return self.state.last_status_hex
         return "--"
@@ -860,6 +1088,7 @@ def run() -> None:
 
     if not address:
         address = pick_bluetooth_device()
+        stop_scan_loop()
 
     asyncio.run(main(address))
 